@@ -3,45 +3,151 @@
 Module 1: Download GOV.UK Frontend Assets
 
 This script downloads GOV.UK Frontend assets for self-hosting in a Jekyll site.
-It extracts the necessary files from the official release.
+It extracts the necessary files from the official release while it downloads.
 
 Usage:
-    python module1_download_assets.py [output_dir] [--version VERSION]
+    python module1_download_assets.py [output_dir] [--version VERSION] [--verbose]
 
 Arguments:
     output_dir           Directory to save the assets (default: ./assets)
     
 Options:
     --version VERSION    Specific version of GOV.UK Frontend to download (default: v5.10.2)
+    --verbose            List every asset file as it is copied
 """
 
 import os
 import sys
-import shutil
-import zipfile
-import tempfile
+import struct
+import zlib
+import time
 import argparse
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import urllib3
 import json
 from pathlib import Path
 import datetime
 
+# Inflate whole members with ISA-L or zlib-ng when installed; both are several times faster than zlib
+try:
+    from isal import isal_zlib as fast_zlib
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as fast_zlib
+    except ImportError:
+        fast_zlib = zlib
+
 # Configuration
 GOVUK_FRONTEND_REPO = "alphagov/govuk-frontend"
 DEFAULT_VERSION = "v5.10.2"
 VERSION_FILE = "govuk_frontend_version.json"
+LATEST_RELEASE_URL = f"https://api.github.com/repos/{GOVUK_FRONTEND_REPO}/releases/latest"
+LATEST_RELEASE_CACHE = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "govuk_frontend", "latest.json")
+LATEST_RELEASE_TTL = 60 * 60  # seconds
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_RESUMES = 3
+DOWNLOAD_TIMEOUT = (10, 60)  # (connect, read) seconds, so a stalled connection raises and can be resumed
+INFLATE_CHUNK_SIZE = 64 * 1024
+EXTRACT_WORKERS = os.cpu_count() or 1
+
+# Shared HTTP session so the release lookup and download reuse connections and TLS sessions
+SESSION = requests.Session()
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=3))
+SESSION.headers["Accept-Encoding"] = "gzip"
+
+# Zip local file header layout, read sequentially as the archive streams in
+ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+ZIP_LOCAL_HEADER = struct.Struct("<HHHHHIIIHH")
+ZIP_DATA_DESCRIPTOR_SIGNATURE = b"PK\x07\x08"
+ZIP_FLAG_DATA_DESCRIPTOR = 0x08
+ZIP_FLAG_UTF8 = 0x800
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+# Assets to copy, keyed by file extension
+ASSET_EXTENSIONS = {
+    '.min.css': "css",
+    '.min.js': "js",
+    '.woff': "fonts",
+    '.woff2': "fonts",
+    '.png': "images",
+    '.svg': "images",
+    '.ico': "images"
+}
+# Longest first, so '.woff2' is tried before '.woff'
+ASSET_SUFFIX_LENGTHS = sorted({len(extension) for extension in ASSET_EXTENSIONS}, reverse=True)
+ASSET_LABELS = {
+    "css": "CSS",
+    "js": "JS",
+    "fonts": "font",
+    "images": "image"
+}
+
+def load_latest_release_cache():
+    """Load the cached latest release lookup, if there is one"""
+    try:
+        with open(LATEST_RELEASE_CACHE, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    
+    # Ignore a cache that parses but doesn't have the shape this module writes
+    if (not isinstance(cache, dict)
+            or not isinstance(cache.get("tag_name"), str)
+            or not isinstance(cache.get("fetched_at"), (int, float))
+            or isinstance(cache.get("fetched_at"), bool)
+            or not isinstance(cache.get("etag"), (str, type(None)))):
+        return {}
+    return cache
+
+def save_latest_release_cache(cache):
+    """Save the latest release lookup so later runs can reuse it"""
+    try:
+        os.makedirs(os.path.dirname(LATEST_RELEASE_CACHE), exist_ok=True)
+        with open(LATEST_RELEASE_CACHE, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Could not save latest version cache: {e}")
 
 def get_latest_version():
-    """Get the latest version of GOV.UK Frontend from GitHub API"""
+    """Get the latest version of GOV.UK Frontend from GitHub API, cached for an hour"""
+    cache = load_latest_release_cache()
+    cached_version = cache.get("tag_name")
+    now = time.time()
+    
+    # A fetched_at in the future (clock skew or a hand-edited cache) counts as stale
+    if cached_version and 0 <= now - cache["fetched_at"] < LATEST_RELEASE_TTL:
+        return cached_version
+    
     try:
-        response = requests.get(f"https://api.github.com/repos/{GOVUK_FRONTEND_REPO}/releases/latest")
-        if response.status_code == 200:
-            return response.json()["tag_name"]
+        # A conditional request gets an empty 304 response if the release hasn't changed
+        headers = {}
+        if cached_version and cache.get("etag"):
+            headers["If-None-Match"] = cache["etag"]
+        response = SESSION.get(LATEST_RELEASE_URL, headers=headers, timeout=5)
+        
+        if response.status_code == 304 and cached_version:
+            cache["fetched_at"] = now
+        elif response.status_code == 200:
+            cache = {
+                "tag_name": response.json()["tag_name"],
+                "etag": response.headers.get("ETag"),
+                "fetched_at": now
+            }
         else:
-            return DEFAULT_VERSION
+            return cached_version or DEFAULT_VERSION
+        
+        save_latest_release_cache(cache)
+        return cache["tag_name"]
     except Exception as e:
         print(f"Error fetching latest version: {e}")
-        return DEFAULT_VERSION
+        return cached_version or DEFAULT_VERSION
 
 def save_version_info(output_dir, version):
     """Save version information to the version file"""
@@ -61,141 +167,295 @@ def save_version_info(output_dir, version):
     
     return version_file_path
 
-def download_govuk_frontend(temp_dir, version=DEFAULT_VERSION):
-    """Download the specified version of GOV.UK Frontend zip file"""
-    zip_url = f"https://github.com/{GOVUK_FRONTEND_REPO}/archive/{version}.zip"
-    print(f"Downloading GOV.UK Frontend {version} from {zip_url}...")
+class ZipStreamReader:
+    """Read a zip archive sequentially from an iterator of byte chunks"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = bytearray()
+
+    def _fill(self):
+        for chunk in self._chunks:
+            if chunk:
+                self._buffer += chunk
+                return
+        raise Exception("Unexpected end of zip stream")
+
+    def read(self, size):
+        """Read exactly size bytes, waiting for more chunks as needed"""
+        while len(self._buffer) < size:
+            self._fill()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def unpack(self, layout):
+        """Read a struct.Struct's worth of bytes and unpack it straight from the buffer"""
+        while len(self._buffer) < layout.size:
+            self._fill()
+        values = layout.unpack_from(self._buffer)
+        del self._buffer[:layout.size]
+        return values
+
+    def read_some(self, max_size=INFLATE_CHUNK_SIZE):
+        """Read up to max_size buffered bytes, waiting for a chunk if nothing is buffered"""
+        if not self._buffer:
+            self._fill()
+        data = bytes(self._buffer[:max_size])
+        del self._buffer[:max_size]
+        return data
+
+    def unread(self, data):
+        """Push bytes back so the next read returns them first"""
+        self._buffer[:0] = data
+
+    def skip(self, size):
+        """Discard exactly size bytes, waiting for more chunks as needed"""
+        while len(self._buffer) < size:
+            size -= len(self._buffer)
+            self._buffer.clear()
+            self._fill()
+        del self._buffer[:size]
+
+def inflate_member(name, method, compressed_data, crc, dest_path):
+    """Inflate a member's compressed data to dest_path, checking its CRC-32"""
+    if method == ZIP_STORED:
+        data = compressed_data
+    elif method == ZIP_DEFLATED:
+        data = fast_zlib.decompress(compressed_data, -zlib.MAX_WBITS)
+    else:
+        raise Exception(f"Unsupported zip compression method: {method}")
     
-    response = requests.get(zip_url, stream=True)
-    if response.status_code != 200:
-        raise Exception(f"Failed to download GOV.UK Frontend: HTTP {response.status_code}")
-    
-    zip_path = os.path.join(temp_dir, "govuk-frontend.zip")
-    
-    with open(zip_path, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
-    
-    print(f"Download complete: {zip_path}")
-    return zip_path
-
-def extract_zip(zip_path, extract_dir):
-    """Extract the zip file"""
-    print(f"Extracting files to {extract_dir}...")
-    
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_dir)
-    
-    # Find the extracted directory (usually govuk-frontend-X.Y.Z)
-    extracted_dirs = [d for d in os.listdir(extract_dir) if os.path.isdir(os.path.join(extract_dir, d))]
-    if not extracted_dirs:
-        raise Exception("Failed to extract GOV.UK Frontend")
-    
-    extracted_dir = os.path.join(extract_dir, extracted_dirs[0])
-    print(f"Extracted to: {extracted_dir}")
-    return extracted_dir
-
-def copy_assets(extracted_dir, output_dir):
-    """Copy necessary assets to the output directory"""
-    # Create asset directories
-    css_dir = os.path.join(output_dir, "css")
-    js_dir = os.path.join(output_dir, "js")
-    fonts_dir = os.path.join(output_dir, "fonts")
-    images_dir = os.path.join(output_dir, "images")
-    
-    os.makedirs(css_dir, exist_ok=True)
-    os.makedirs(js_dir, exist_ok=True)
-    os.makedirs(fonts_dir, exist_ok=True)
-    os.makedirs(images_dir, exist_ok=True)
-    
-    # Copy CSS files
-    css_files = []
-    for root, dirs, files in os.walk(extracted_dir):
-        for file in files:
-            if file.endswith('.min.css'):
-                src_path = os.path.join(root, file)
-                dest_path = os.path.join(css_dir, file)
-                shutil.copy2(src_path, dest_path)
-                css_files.append(dest_path)
-                print(f"Copied CSS: {file}")
-    
-    # Copy JS files
-    js_files = []
-    for root, dirs, files in os.walk(extracted_dir):
-        for file in files:
-            if file.endswith('.min.js'):
-                src_path = os.path.join(root, file)
-                dest_path = os.path.join(js_dir, file)
-                shutil.copy2(src_path, dest_path)
-                js_files.append(dest_path)
-                print(f"Copied JS: {file}")
-    
-    # Copy font files
-    font_files = []
-    for root, dirs, files in os.walk(extracted_dir):
-        for file in files:
-            if file.endswith(('.woff', '.woff2')):
-                src_path = os.path.join(root, file)
-                dest_path = os.path.join(fonts_dir, file)
-                shutil.copy2(src_path, dest_path)
-                font_files.append(dest_path)
-                print(f"Copied font: {file}")
-    
-    # Copy image files
-    image_files = []
-    for root, dirs, files in os.walk(extracted_dir):
-        for file in files:
-            if file.endswith(('.png', '.svg', '.ico')):
-                src_path = os.path.join(root, file)
-                dest_path = os.path.join(images_dir, file)
-                shutil.copy2(src_path, dest_path)
-                image_files.append(dest_path)
-                print(f"Copied image: {file}")
-    
-    return {
-        "css": css_files,
-        "js": js_files,
-        "fonts": font_files,
-        "images": image_files
-    }
+    if fast_zlib.crc32(data) != crc:
+        raise Exception(f"CRC check failed for {name}")
+    
+    with open(dest_path, 'wb') as f:
+        f.write(data)
 
-def main():
-    parser = argparse.ArgumentParser(description="Download GOV.UK Frontend assets for self-hosting")
-    parser.add_argument("output_dir", nargs="?", default="./assets", help="Output directory for assets")
-    parser.add_argument("--version", default=DEFAULT_VERSION, help="Version of GOV.UK Frontend to download")
+def inflate_streamed_member(reader, method, write):
+    """Inflate a member whose size only follows its data, passing it to write and returning its CRC-32"""
+    if method != ZIP_DEFLATED:
+        raise Exception(f"Unsupported zip compression method for a streamed entry: {method}")
     
-    args = parser.parse_args()
+    # The size is unknown up front, so inflate until the deflate stream ends. This relies on
+    # zlib's unused_data, which isal does not always fill in, so it stays on the stdlib zlib.
+    crc = 0
+    decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+    while not decompressor.eof:
+        data = decompressor.decompress(reader.read_some())
+        crc = zlib.crc32(data, crc)
+        write(data)
+    reader.unread(decompressor.unused_data)
     
-    # Create output directory if it doesn't exist
-    os.makedirs(args.output_dir, exist_ok=True)
+    # Data descriptor: optional signature, then CRC-32 and both sizes
+    descriptor = reader.read(4)
+    if descriptor == ZIP_DATA_DESCRIPTOR_SIGNATURE:
+        descriptor = reader.read(4)
+    reader.skip(8)
     
-    # Create temporary directory for download and extraction
-    with tempfile.TemporaryDirectory() as temp_dir:
-        try:
-            # Download GOV.UK Frontend
-            zip_path = download_govuk_frontend(temp_dir, args.version)
+    if crc != struct.unpack("<I", descriptor)[0]:
+        raise Exception("CRC check failed for a streamed zip entry")
+    return crc
+
+def stream_extract_zip(chunks, destination):
+    """Extract a zip archive from an iterator of byte chunks as they arrive
+
+    destination(name) returns the path to write each file to, or None to skip it.
+    Returns the paths written, in archive order.
+    """
+    reader = ZipStreamReader(chunks)
+    
+    # Members are read from their local headers; the central directory at the end is not needed.
+    # Reading is sequential, but inflating a member is handed to a worker once its data has arrived.
+    pending = {}
+    with ThreadPoolExecutor(max_workers=EXTRACT_WORKERS) as executor:
+        while reader.read(4) == ZIP_LOCAL_SIGNATURE:
+            (_version, flags, method, _mod_time, _mod_date, crc, compressed_size,
+             _size, name_length, extra_length) = reader.unpack(ZIP_LOCAL_HEADER)
+            name = reader.read(name_length).decode('utf-8' if flags & ZIP_FLAG_UTF8 else 'cp437')
+            reader.skip(extra_length)
             
-            # Extract the zip file
-            extracted_dir = extract_zip(zip_path, temp_dir)
+            dest_path = None if name.endswith('/') else destination(name)
             
-            # Copy assets to output directory
-            copied_files = copy_assets(extracted_dir, args.output_dir)
+            if dest_path is None:
+                if flags & ZIP_FLAG_DATA_DESCRIPTOR:
+                    # Without a size up front the data has to be inflated to find where it ends
+                    inflate_streamed_member(reader, method, lambda data: None)
+                else:
+                    # Skip directories and unwanted files without inflating them
+                    reader.skip(compressed_size)
+                continue
             
-            # Save version information
-            version_file = save_version_info(args.output_dir, args.version)
+            # A later member with the same destination replaces an earlier one, as it would in order
+            if pending.get(dest_path):
+                pending[dest_path].result()
             
-            print("\nAsset download and extraction complete!")
-            print(f"Assets saved to: {os.path.abspath(args.output_dir)}")
-            print(f"Version information saved to: {os.path.abspath(version_file)}")
-            print("\nSummary of copied files:")
-            print(f"CSS files: {len(copied_files['css'])}")
-            print(f"JavaScript files: {len(copied_files['js'])}")
-            print(f"Font files: {len(copied_files['fonts'])}")
-            print(f"Image files: {len(copied_files['images'])}")
+            if flags & ZIP_FLAG_DATA_DESCRIPTOR:
+                with open(dest_path, 'wb') as f:
+                    inflate_streamed_member(reader, method, f.write)
+                pending[dest_path] = None
+            else:
+                compressed_data = reader.read(compressed_size)
+                pending[dest_path] = executor.submit(inflate_member, name, method, compressed_data, crc, dest_path)
+        
+        for future in pending.values():
+            if future:
+                future.result()
+    
+    return list(pending)
+
+def iter_download(url):
+    """Yield the body of url in chunks, resuming with a Range request if the connection drops"""
+    received = 0
+    resumes = 0
+    validator = None
+    
+    while True:
+        headers = {}
+        if received:
+            # If-Range makes the server send the whole new archive instead of splicing it onto the old one
+            headers = {"Range": f"bytes={received}-", "If-Range": validator}
+        with SESSION.get(url, headers=headers, stream=True, allow_redirects=False, timeout=DOWNLOAD_TIMEOUT) as response:
+            if response.is_redirect:
+                raise Exception(f"GOV.UK Frontend download unexpectedly redirected to {response.headers['Location']}")
+            if received and response.status_code == 200:
+                raise Exception("GOV.UK Frontend archive changed while it was being downloaded")
+            if response.status_code != (206 if received else 200):
+                raise Exception(f"Failed to download GOV.UK Frontend: HTTP {response.status_code}")
+            if received and not response.headers.get("Content-Range", "").startswith(f"bytes {received}-"):
+                raise Exception(f"GOV.UK Frontend download resumed at the wrong offset: {response.headers.get('Content-Range')}")
+            
+            if not received:
+                # A weak ETag can't be used with If-Range, so fall back to Last-Modified
+                etag = response.headers.get("ETag")
+                validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+                # Byte offsets only line up with what has been received if the body isn't re-encoded
+                resumable = (validator is not None
+                             and response.headers.get("Accept-Ranges") == "bytes"
+                             and response.headers.get("Content-Encoding", "identity") == "identity")
             
+            # Read the raw socket stream directly rather than through iter_content's chunking
+            response.raw.decode_content = True
+            try:
+                for chunk in iter(functools.partial(response.raw.read, DOWNLOAD_CHUNK_SIZE), b""):
+                    received += len(chunk)
+                    yield chunk
+                return
+            except (OSError, urllib3.exceptions.HTTPError) as e:
+                if not resumable or resumes == DOWNLOAD_RESUMES:
+                    raise
+                resumes += 1
+                print(f"Download interrupted after {received} bytes ({e}), resuming...")
+
+def iter_in_background(chunks):
+    """Pull chunks from an iterator on a background thread, yielding them as they arrive"""
+    # Unbounded so the reader never stalls; the archive is only a few MB
+    chunk_queue = queue.Queue()
+    done = object()
+    
+    def read_chunks():
+        try:
+            for chunk in chunks:
+                chunk_queue.put(chunk)
+            chunk_queue.put(done)
         except Exception as e:
-            print(f"Error: {e}")
-            sys.exit(1)
+            chunk_queue.put(e)
+    
+    threading.Thread(target=read_chunks, daemon=True).start()
+    
+    while True:
+        chunk = chunk_queue.get()
+        if chunk is done:
+            return
+        if isinstance(chunk, Exception):
+            raise chunk
+        yield chunk
+
+def asset_category(file):
+    """Return the asset category for a file name, or None if it isn't an asset"""
+    # One slice and dict lookup per suffix length instead of an endswith per extension
+    for length in ASSET_SUFFIX_LENGTHS:
+        category = ASSET_EXTENSIONS.get(file[-length:])
+        if category:
+            return category
+    return None
+
+def download_govuk_frontend(output_dir, version=DEFAULT_VERSION, verbose=False):
+    """Download the specified version of GOV.UK Frontend, extracting its assets into output_dir as it arrives"""
+    # Create asset directories once, up front
+    asset_dirs = {category: os.path.join(output_dir, category) for category in ASSET_LABELS}
+    for asset_dir in asset_dirs.values():
+        os.makedirs(asset_dir, exist_ok=True)
+    
+    def asset_path(name):
+        # Assets are written straight into their category directory; everything else is skipped.
+        # Backslashes are treated as separators too, since this reader doesn't sanitise names like zipfile did
+        file = name.replace('\\', '/').rpartition('/')[2]
+        category = asset_category(file)
+        if not category:
+            return None
+        path = os.path.join(asset_dirs[category], file)
+        # Anything that doesn't land directly in the category directory (e.g. a drive-relative 'C:x.png') is skipped
+        if os.path.dirname(path) != asset_dirs[category]:
+            return None
+        return path
+    
+    # github.com/<repo>/archive/<tag>.zip only redirects here, so skip the extra round trip
+    zip_url = f"https://codeload.github.com/{GOVUK_FRONTEND_REPO}/zip/refs/tags/{version}"
+    print(f"Downloading GOV.UK Frontend {version} from {zip_url}...")
+    
+    # Read the download on a background thread so the network keeps flowing while members are extracted
+    print(f"Extracting assets to {output_dir}...")
+    asset_paths = stream_extract_zip(iter_in_background(iter_download(zip_url)), asset_path)
+    
+    print("Download complete")
+    if not asset_paths:
+        raise Exception("Failed to extract GOV.UK Frontend: no assets found in the archive")
+    
+    copied_files = {category: [] for category in ASSET_LABELS}
+    for path in asset_paths:
+        category = asset_category(path)
+        copied_files[category].append(path)
+        if verbose:
+            print(f"Copied {ASSET_LABELS[category]}: {os.path.basename(path)}")
+    
+    return copied_files
+
+def download_assets(output_dir, version=DEFAULT_VERSION, verbose=False):
+    """Download GOV.UK Frontend and copy its assets into output_dir"""
+    # Create output directory if it doesn't exist
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Download GOV.UK Frontend, extracting the assets straight into the output directory
+    copied_files = download_govuk_frontend(output_dir, version, verbose)
+    
+    # Save version information
+    version_file = save_version_info(output_dir, version)
+    
+    print("\nAsset download and extraction complete!")
+    print(f"Assets saved to: {os.path.abspath(output_dir)}")
+    print(f"Version information saved to: {os.path.abspath(version_file)}")
+    print("\nSummary of copied files:")
+    print(f"CSS files: {len(copied_files['css'])}")
+    print(f"JavaScript files: {len(copied_files['js'])}")
+    print(f"Font files: {len(copied_files['fonts'])}")
+    print(f"Image files: {len(copied_files['images'])}")
+    
+    return copied_files
+
+def main():
+    parser = argparse.ArgumentParser(description="Download GOV.UK Frontend assets for self-hosting")
+    parser.add_argument("output_dir", nargs="?", default="./assets", help="Output directory for assets")
+    parser.add_argument("--version", default=DEFAULT_VERSION, help="Version of GOV.UK Frontend to download")
+    parser.add_argument("--verbose", action="store_true", help="List every asset file as it is copied")
+    
+    args = parser.parse_args()
+    
+    try:
+        download_assets(args.output_dir, args.version, args.verbose)
+    except Exception as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
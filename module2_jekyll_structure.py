@@ -22,7 +22,7 @@ import argparse
 import json
 import datetime
 import shutil
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 GOVUK_FRONTEND_VERSION = "5.10.2"
@@ -41,6 +41,16 @@ JEKYLL_DIRS = [
     "assets/fonts"
 ]
 
+# Logos shared by every page, kept as Jekyll includes rather than inline in the layout
+GOVUK_CROWN_SVG = """<svg aria-hidden="true" focusable="false" class="govuk-header__logotype-crown" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 132 97" height="30" width="36">
+  <path fill="currentColor" fill-rule="evenodd" d="M25 30.2c3.5 1.5 7.7-.2 9.1-3.7 1.5-3.6-.2-7.8-3.9-9.2-3.6-1.4-7.6.3-9.1 3.9-1.4 3.5.3 7.5 3.9 9zM9 39.5c3.6 1.5 7.8-.2 9.2-3.7 1.5-3.6-.2-7.8-3.9-9.1-3.6-1.5-7.6.2-9.1 3.8-1.4 3.5.3 7.5 3.8 9zM4.4 57.2c3.5 1.5 7.7-.2 9.1-3.8 1.5-3.6-.2-7.7-3.9-9.1-3.5-1.5-7.6.3-9.1 3.8-1.4 3.5.3 7.6 3.9 9.1zm38.3-21.4c3.5 1.5 7.7-.2 9.1-3.8 1.5-3.6-.2-7.7-3.9-9.1-3.6-1.5-7.6.3-9.1 3.8-1.3 3.6.4 7.7 3.9 9.1zm64.4-5.6c-3.6 1.5-7.8-.2-9.1-3.7-1.5-3.6.2-7.8 3.8-9.2 3.6-1.4 7.7.3 9.2 3.9 1.3 3.5-.4 7.5-3.9 9zm15.9 9.3c-3.6 1.5-7.7-.2-9.1-3.7-1.5-3.6.2-7.8 3.7-9.1 3.6-1.5 7.7.2 9.2 3.8 1.5 3.5-.3 7.5-3.8 9zm4.7 17.7c-3.6 1.5-7.8-.2-9.2-3.8-1.5-3.6.2-7.7 3.9-9.1 3.6-1.5 7.7.3 9.2 3.8 1.3 3.5-.4 7.6-3.9 9.1zM89.3 35.8c-3.6 1.5-7.8-.2-9.2-3.8-1.4-3.6.2-7.7 3.9-9.1 3.6-1.5 7.7.3 9.2 3.8 1.4 3.6-.3 7.7-3.9 9.1zM69.7 17.7l8.9 4.7V9.3l-8.9 2.8c-.2-.3-.5-.6-.9-.9L72.4 0H59.6l3.5 11.2c-.3.3-.6.5-.9.9l-8.8-2.8v13.1l8.8-4.7c.3.3.6.7.9.9l-5 15.4v.1c-.2.8-.4 1.6-.4 2.4 0 4.1 3.1 7.5 7 8.1h.2c.3 0 .7.1 1 .1.4 0 .7 0 1-.1h.2c4-.6 7.1-4.1 7.1-8.1 0-.8-.1-1.7-.4-2.4V34l-5.1-15.4c.4-.2.7-.6 1-.9zM66 92.8c16.9 0 32.8 1.1 47.1 3.2 4-16.9 8.9-26.7 14-33.5l-9.6-3.4c1 4.9 1.1 7.2 0 10.2-1.5-1.4-3-4.3-4.2-8.7L108.6 76c2.8-2 5-3.2 7.5-3.3-4.4 9.4-10 11.9-13.6 11.2-4.3-.8-6.3-4.6-5.6-7.9 1-4.7 5.7-5.9 8-.5 4.3-8.7-3-11.4-7.6-8.8 7.1-7.2 7.9-13.5 2.1-21.1-8 6.1-8.1 12.3-4.5 20.8-4.7-5.4-12.1-2.5-9.5 6.2 3.4-5.2 7.9-2 7.2 3.1-.6 4.3-6.4 7.8-13.5 7.2-10.3-.9-10.9-8-11.2-13.8 2.5-.5 7.1 1.8 11 7.3L80.2 60c-4.1 4.4-8 5.3-12.3 5.4 1.4-4.4 8-11.6 8-11.6H55.5s6.4 7.2 7.9 11.6c-4.2-.1-8-1-12.3-5.4l1.4 16.4c3.9-5.5 8.5-7.7 10.9-7.3-.3 5.8-.9 12.8-11.1 13.8-7.2.6-12.9-2.9-13.5-7.2-.7-5 3.8-8.3 7.1-3.1 2.7-8.7-4.6-11.6-9.4-6.2 3.7-8.5 3.6-14.7-4.6-20.8-5.8 7.6-5 13.9 2.2 21.1-4.7-2.6-11.9.1-7.7 8.8 2.3-5.5 7.1-4.2 8.1.5.7 3.3-1.3 7.1-5.7 7.9-3.5.7-9-1.8-13.5-11.2 2.5.1 4.7 1.3 7.5 3.3l-4.7-15.4c-1.2 4.4-2.7 7.2-4.3 8.7-1.1-3-.9-5.3 0-10.2l-9.5 3.4c5 6.9 9.9 16.7 14 33.5 14.8-2.1 30.8-3.2 47.7-3.2z"></path>
+</svg>
+"""
+GOVUK_OGL_SVG = """<svg aria-hidden="true" focusable="false" class="govuk-footer__licence-logo" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 483.2 195.7" height="17" width="41">
+  <path fill="currentColor" d="M421.5 142.8V.1l-50.7 32.3v161.1h112.4v-50.7zm-122.3-9.6A47.12 47.12 0 0 1 221 97.8c0-26 21.1-47.1 47.1-47.1 16.7 0 31.4 8.7 39.7 21.8l42.7-27.2A97.63 97.63 0 0 0 268.1 0c-36.5 0-68.3 20.1-85.1 49.7A98 98 0 0 0 97.8 0C43.9 0 0 43.9 0 97.8s43.9 97.8 97.8 97.8c36.5 0 68.3-20.1 85.1-49.7a97.76 97.76 0 0 0 149.6 25.4l19.4 22.2h3v-87.8h-80l24.3 27.5zM97.8 145c-26 0-47.1-21.1-47.1-47.1s21.1-47.1 47.1-47.1 47.2 21 47.2 47S123.8 145 97.8 145"></path>
+</svg>
+"""
+
 def create_jekyll_structure(output_dir):
     """Create the necessary directory structure for Jekyll"""
     print(f"Creating Jekyll directory structure in {output_dir}...")
@@ -49,7 +59,7 @@ def create_jekyll_structure(output_dir):
         os.makedirs(dir_path, exist_ok=True)
 
 def create_config_yml(output_dir, site_name="GOV.UK Frontend Jekyll Site"):
-    """Create a Jekyll _config.yml file"""
+    """Build the Jekyll _config.yml file, returning its path and content"""
     config_content = f"""# Site settings
 title: {site_name}
 email: your-email@example.com
@@ -78,23 +88,19 @@ exclude:
   - govuk_jekyll_integration.py
 """
     
-    with open(os.path.join(output_dir, "_config.yml"), 'w') as f:
-        f.write(config_content)
-    print("Created _config.yml")
+    return os.path.join(output_dir, "_config.yml"), config_content
 
 def create_gemfile(output_dir):
-    """Create a Gemfile for the Jekyll site"""
+    """Build a Gemfile for the Jekyll site, returning its path and content"""
     gemfile_content = """source "https://rubygems.org"
 
 gem "github-pages", group: :jekyll_plugins
 """
     
-    with open(os.path.join(output_dir, "Gemfile"), 'w') as f:
-        f.write(gemfile_content)
-    print("Created Gemfile")
+    return os.path.join(output_dir, "Gemfile"), gemfile_content
 
 def create_custom_css(output_dir):
-    """Create a custom CSS file for additional styles"""
+    """Build a custom CSS file for additional styles, returning its path and content"""
     css_content = """---
 ---
 /* Custom styles for GOV.UK Frontend Jekyll site */
@@ -102,12 +108,17 @@ def create_custom_css(output_dir):
 /* Add your custom styles below */
 """
     
-    with open(os.path.join(output_dir, "assets/css/custom.css"), 'w') as f:
-        f.write(css_content)
-    print("Created custom.css")
+    return os.path.join(output_dir, "assets/css/custom.css"), css_content
+
+def create_includes(output_dir):
+    """Build the logo includes used by the default layout, returning their paths and contents"""
+    return [
+        (os.path.join(output_dir, "_includes", "govuk-crown.svg"), GOVUK_CROWN_SVG),
+        (os.path.join(output_dir, "_includes", "govuk-ogl.svg"), GOVUK_OGL_SVG)
+    ]
 
 def create_default_layout(output_dir, use_cdn=False):
-    """Create a default Jekyll layout that uses GOV.UK Frontend"""
+    """Build a default Jekyll layout that uses GOV.UK Frontend, returning its path and content"""
     
     # Determine asset paths based on mode
     if use_cdn:
@@ -153,9 +164,7 @@ def create_default_layout(output_dir, use_cdn=False):
         <div class="govuk-header__logo">
           <a href="{{{{ '/' | relative_url }}}}" class="govuk-header__link govuk-header__link--homepage">
             <span class="govuk-header__logotype">
-              <svg aria-hidden="true" focusable="false" class="govuk-header__logotype-crown" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 132 97" height="30" width="36">
-                <path fill="currentColor" fill-rule="evenodd" d="M25 30.2c3.5 1.5 7.7-.2 9.1-3.7 1.5-3.6-.2-7.8-3.9-9.2-3.6-1.4-7.6.3-9.1 3.9-1.4 3.5.3 7.5 3.9 9zM9 39.5c3.6 1.5 7.8-.2 9.2-3.7 1.5-3.6-.2-7.8-3.9-9.1-3.6-1.5-7.6.2-9.1 3.8-1.4 3.5.3 7.5 3.8 9zM4.4 57.2c3.5 1.5 7.7-.2 9.1-3.8 1.5-3.6-.2-7.7-3.9-9.1-3.5-1.5-7.6.3-9.1 3.8-1.4 3.5.3 7.6 3.9 9.1zm38.3-21.4c3.5 1.5 7.7-.2 9.1-3.8 1.5-3.6-.2-7.7-3.9-9.1-3.6-1.5-7.6.3-9.1 3.8-1.3 3.6.4 7.7 3.9 9.1zm64.4-5.6c-3.6 1.5-7.8-.2-9.1-3.7-1.5-3.6.2-7.8 3.8-9.2 3.6-1.4 7.7.3 9.2 3.9 1.3 3.5-.4 7.5-3.9 9zm15.9 9.3c-3.6 1.5-7.7-.2-9.1-3.7-1.5-3.6.2-7.8 3.7-9.1 3.6-1.5 7.7.2 9.2 3.8 1.5 3.5-.3 7.5-3.8 9zm4.7 17.7c-3.6 1.5-7.8-.2-9.2-3.8-1.5-3.6.2-7.7 3.9-9.1 3.6-1.5 7.7.3 9.2 3.8 1.3 3.5-.4 7.6-3.9 9.1zM89.3 35.8c-3.6 1.5-7.8-.2-9.2-3.8-1.4-3.6.2-7.7 3.9-9.1 3.6-1.5 7.7.3 9.2 3.8 1.4 3.6-.3 7.7-3.9 9.1zM69.7 17.7l8.9 4.7V9.3l-8.9 2.8c-.2-.3-.5-.6-.9-.9L72.4 0H59.6l3.5 11.2c-.3.3-.6.5-.9.9l-8.8-2.8v13.1l8.8-4.7c.3.3.6.7.9.9l-5 15.4v.1c-.2.8-.4 1.6-.4 2.4 0 4.1 3.1 7.5 7 8.1h.2c.3 0 .7.1 1 .1.4 0 .7 0 1-.1h.2c4-.6 7.1-4.1 7.1-8.1 0-.8-.1-1.7-.4-2.4V34l-5.1-15.4c.4-.2.7-.6 1-.9zM66 92.8c16.9 0 32.8 1.1 47.1 3.2 4-16.9 8.9-26.7 14-33.5l-9.6-3.4c1 4.9 1.1 7.2 0 10.2-1.5-1.4-3-4.3-4.2-8.7L108.6 76c2.8-2 5-3.2 7.5-3.3-4.4 9.4-10 11.9-13.6 11.2-4.3-.8-6.3-4.6-5.6-7.9 1-4.7 5.7-5.9 8-.5 4.3-8.7-3-11.4-7.6-8.8 7.1-7.2 7.9-13.5 2.1-21.1-8 6.1-8.1 12.3-4.5 20.8-4.7-5.4-12.1-2.5-9.5 6.2 3.4-5.2 7.9-2 7.2 3.1-.6 4.3-6.4 7.8-13.5 7.2-10.3-.9-10.9-8-11.2-13.8 2.5-.5 7.1 1.8 11 7.3L80.2 60c-4.1 4.4-8 5.3-12.3 5.4 1.4-4.4 8-11.6 8-11.6H55.5s6.4 7.2 7.9 11.6c-4.2-.1-8-1-12.3-5.4l1.4 16.4c3.9-5.5 8.5-7.7 10.9-7.3-.3 5.8-.9 12.8-11.1 13.8-7.2.6-12.9-2.9-13.5-7.2-.7-5 3.8-8.3 7.1-3.1 2.7-8.7-4.6-11.6-9.4-6.2 3.7-8.5 3.6-14.7-4.6-20.8-5.8 7.6-5 13.9 2.2 21.1-4.7-2.6-11.9.1-7.7 8.8 2.3-5.5 7.1-4.2 8.1.5.7 3.3-1.3 7.1-5.7 7.9-3.5.7-9-1.8-13.5-11.2 2.5.1 4.7 1.3 7.5 3.3l-4.7-15.4c-1.2 4.4-2.7 7.2-4.3 8.7-1.1-3-.9-5.3 0-10.2l-9.5 3.4c5 6.9 9.9 16.7 14 33.5 14.8-2.1 30.8-3.2 47.7-3.2z"></path>
-              </svg>
+              {{% include govuk-crown.svg %}}
               <span class="govuk-header__logotype-text">
                 GOV.UK
               </span>
@@ -221,9 +230,7 @@ def create_default_layout(output_dir, use_cdn=False):
               </li>
             </ul>
             
-            <svg aria-hidden="true" focusable="false" class="govuk-footer__licence-logo" xmlns="http://www.w3.org/2000/svg" viewBox="0 0 483.2 195.7" height="17" width="41">
-              <path fill="currentColor" d="M421.5 142.8V.1l-50.7 32.3v161.1h112.4v-50.7zm-122.3-9.6A47.12 47.12 0 0 1 221 97.8c0-26 21.1-47.1 47.1-47.1 16.7 0 31.4 8.7 39.7 21.8l42.7-27.2A97.63 97.63 0 0 0 268.1 0c-36.5 0-68.3 20.1-85.1 49.7A98 98 0 0 0 97.8 0C43.9 0 0 43.9 0 97.8s43.9 97.8 97.8 97.8c36.5 0 68.3-20.1 85.1-49.7a97.76 97.76 0 0 0 149.6 25.4l19.4 22.2h3v-87.8h-80l24.3 27.5zM97.8 145c-26 0-47.1-21.1-47.1-47.1s21.1-47.1 47.1-47.1 47.2 21 47.2 47S123.8 145 97.8 145"></path>
-            </svg>
+            {{% include govuk-ogl.svg %}}
             <span class="govuk-footer__licence-description">
               All content is available under the
               <a class="govuk-footer__link" href="https://www.nationalarchives.gov.uk/doc/open-government-licence/version/3/" rel="license">Open Government Licence v3.0</a>, except where otherwise stated
@@ -243,15 +250,10 @@ def create_default_layout(output_dir, use_cdn=False):
 </html>
 """
     
-    layouts_dir = os.path.join(output_dir, "_layouts")
-    os.makedirs(layouts_dir, exist_ok=True)
-    
-    with open(os.path.join(layouts_dir, "govuk-default.html"), 'w') as f:
-        f.write(layout_content)
-    print("Created govuk-default.html layout")
+    return os.path.join(output_dir, "_layouts", "govuk-default.html"), layout_content
 
 def create_index_page(output_dir):
-    """Create a simple index page"""
+    """Build a simple index page, returning its path and content"""
     index_content = """---
 layout: govuk-default
 title: Home
@@ -283,12 +285,10 @@ title: Home
 </div>
 """
     
-    with open(os.path.join(output_dir, "index.md"), 'w') as f:
-        f.write(index_content)
-    print("Created index.md")
+    return os.path.join(output_dir, "index.md"), index_content
 
 def create_readme(output_dir, version, use_cdn=False):
-    """Create a README file with usage instructions"""
+    """Build a README file with usage instructions, returning its path and content"""
     asset_mode = "CDN" if use_cdn else "self-hosted"
     
     readme_content = f"""# GOV.UK Frontend for Jekyll
@@ -340,27 +340,59 @@ You can customize this site by:
 4. Creating new pages using the GOV.UK Frontend components
 """
     
-    with open(os.path.join(output_dir, "README.md"), 'w') as f:
-        f.write(readme_content)
-    print("Created README.md")
+    return os.path.join(output_dir, "README.md"), readme_content
+
+def file_unchanged(path, data):
+    """Check whether a file already holds exactly the given bytes"""
+    try:
+        # A size mismatch settles it without reading the file
+        if os.stat(path).st_size != len(data):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == data
+    except FileNotFoundError:
+        return False
+
+def write_files(files):
+    """Write a list of (path, content) pairs concurrently"""
+    def write_file(item):
+        path, content = item
+        data = content.encode('utf-8')
+        # Leave identical files untouched, since a new layout mtime makes Jekyll rebuild every page
+        if file_unchanged(path, data):
+            return path, False
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path, True
+    
+    # The files are independent, so their writes can overlap
+    with ThreadPoolExecutor() as executor:
+        for path, written in executor.map(write_file, files):
+            if written:
+                print(f"Created {os.path.basename(path)}")
+            else:
+                print(f"Unchanged {os.path.basename(path)}")
 
 def download_assets_if_needed(output_dir, version):
     """Download assets if using self-hosted mode"""
     assets_dir = os.path.join(output_dir, "assets")
     
-    # Check if module1 script exists
-    module1_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "module1_download_assets.py")
-    
-    if os.path.exists(module1_path):
-        print("Downloading GOV.UK Frontend assets for self-hosting...")
-        try:
-            subprocess.run([sys.executable, module1_path, assets_dir, "--version", f"v{version}"], check=True)
-            return True
-        except subprocess.CalledProcessError as e:
+    # Run module1 in this process rather than starting a new interpreter for it
+    try:
+        import module1_download_assets
+    except ImportError as e:
+        if e.name == "module1_download_assets":
+            print("Warning: module1_download_assets.py not found. Please download assets manually.")
+        else:
             print(f"Warning: Failed to download assets: {e}")
-            return False
-    else:
-        print("Warning: module1_download_assets.py not found. Please download assets manually.")
+        return False
+    
+    print("Downloading GOV.UK Frontend assets for self-hosting...")
+    try:
+        module1_download_assets.download_assets(assets_dir, f"v{version}")
+        return True
+    except Exception as e:
+        print(f"Warning: Failed to download assets: {e}")
         return False
 
 def main():
@@ -378,27 +410,24 @@ def main():
         # Create Jekyll structure
         create_jekyll_structure(args.output_dir)
         
-        # Download assets if using self-hosted mode
-        if not args.cdn:
-            download_assets_if_needed(args.output_dir, GOVUK_FRONTEND_VERSION)
-        
-        # Create config.yml
-        create_config_yml(args.output_dir, args.site_name)
-        
-        # Create Gemfile
-        create_gemfile(args.output_dir)
-        
-        # Create custom CSS
-        create_custom_css(args.output_dir)
-        
-        # Create default layout
-        create_default_layout(args.output_dir, args.cdn)
-        
-        # Create index page
-        create_index_page(args.output_dir)
-        
-        # Create README
-        create_readme(args.output_dir, f"v{GOVUK_FRONTEND_VERSION}", args.cdn)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Download assets if using self-hosted mode, in the background while the site files are written
+            if not args.cdn:
+                download = executor.submit(download_assets_if_needed, args.output_dir, GOVUK_FRONTEND_VERSION)
+            
+            # Create config.yml, Gemfile, custom CSS, default layout, index page, README and logo includes
+            write_files([
+                create_config_yml(args.output_dir, args.site_name),
+                create_gemfile(args.output_dir),
+                create_custom_css(args.output_dir),
+                create_default_layout(args.output_dir, args.cdn),
+                create_index_page(args.output_dir),
+                create_readme(args.output_dir, f"v{GOVUK_FRONTEND_VERSION}", args.cdn),
+                *create_includes(args.output_dir)
+            ])
+            
+            if not args.cdn:
+                download.result()
         
         asset_mode = "CDN" if args.cdn else "self-hosted"
         print(f"\nJekyll structure with GOV.UK Frontend v{GOVUK_FRONTEND_VERSION} ({asset_mode} mode) has been created in {args.output_dir}")
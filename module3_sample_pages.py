@@ -14,372 +14,182 @@ Arguments:
 
 import os
 import sys
-import argparse
-import json
-
-def create_start_page(site_dir):
-    """Create a sample start page"""
-    content = """---
-layout: govuk-default
-title: Start page example
----
-
-<div class="govuk-grid-row">
-  <div class="govuk-grid-column-two-thirds">
-    <h1 class="govuk-heading-xl">Service name goes here</h1>
-
-    <p class="govuk-body">Use this service to:</p>
-
-    <ul class="govuk-list govuk-list--bullet">
-      <li>do something</li>
-      <li>update something</li>
-      <li>apply for something</li>
-    </ul>
-
-    <p class="govuk-body">Registering takes around 5 minutes.</p>
-
-    <a href="question-page" role="button" draggable="false" class="govuk-button govuk-button--start" data-module="govuk-button">
-      Start now
-      <svg class="govuk-button__start-icon" xmlns="http://www.w3.org/2000/svg" width="17.5" height="19" viewBox="0 0 33 40" aria-hidden="true" focusable="false">
-        <path fill="currentColor" d="M0 0h13l20 20-20 20H0l20-20z" />
-      </svg>
-    </a>
-
-    <h2 class="govuk-heading-m">Before you start</h2>
-
-    <p class="govuk-body">You'll need:</p>
-
-    <ul class="govuk-list govuk-list--bullet">
-      <li>item 1</li>
-      <li>item 2</li>
-      <li>item 3</li>
-    </ul>
-
-    <p class="govuk-body">
-      Read the <a href="#" class="govuk-link">guidance notes</a> before completing this application.
-    </p>
-  </div>
-
-  <div class="govuk-grid-column-one-third">
-    <aside class="govuk-prototype-kit-common-templates-related-items" role="complementary">
-      <h2 class="govuk-heading-m" id="subsection-title">
-        Related content
-      </h2>
-      <nav role="navigation" aria-labelledby="subsection-title">
-        <ul class="govuk-list govuk-!-font-size-16">
-          <li>
-            <a href="#" class="govuk-link">
-              Related link
-            </a>
-          </li>
-          <li>
-            <a href="#" class="govuk-link">
-              Related link
-            </a>
-          </li>
-        </ul>
-      </nav>
-    </aside>
-  </div>
-</div>
-"""
-    
-    with open(os.path.join(site_dir, "start-page.md"), 'w') as f:
-        f.write(content)
-    print("Created start-page.md")
-
-def create_question_page(site_dir):
-    """Create a sample question page"""
-    content = """---
-layout: govuk-default
-title: Question page example
-show_back_link: true
----
-
-<div class="govuk-grid-row">
-  <div class="govuk-grid-column-two-thirds">
-    <form action="components" method="get">
-      <div class="govuk-form-group">
-        <fieldset class="govuk-fieldset">
-          <legend class="govuk-fieldset__legend govuk-fieldset__legend--l">
-            <h1 class="govuk-fieldset__heading">
-              Where do you live?
-            </h1>
-          </legend>
-          
-          <div class="govuk-radios" data-module="govuk-radios">
-            <div class="govuk-radios__item">
-              <input class="govuk-radios__input" id="where-do-you-live" name="where-do-you-live" type="radio" value="england">
-              <label class="govuk-label govuk-radios__label" for="where-do-you-live">
-                England
-              </label>
-            </div>
-            <div class="govuk-radios__item">
-              <input class="govuk-radios__input" id="where-do-you-live-2" name="where-do-you-live" type="radio" value="scotland">
-              <label class="govuk-label govuk-radios__label" for="where-do-you-live-2">
-                Scotland
-              </label>
-            </div>
-            <div class="govuk-radios__item">
-              <input class="govuk-radios__input" id="where-do-you-live-3" name="where-do-you-live" type="radio" value="wales">
-              <label class="govuk-label govuk-radios__label" for="where-do-you-live-3">
-                Wales
-              </label>
-            </div>
-            <div class="govuk-radios__item">
-              <input class="govuk-radios__input" id="where-do-you-live-4" name="where-do-you-live" type="radio" value="northern-ireland">
-              <label class="govuk-label govuk-radios__label" for="where-do-you-live-4">
-                Northern Ireland
-              </label>
-            </div>
-            <div class="govuk-radios__divider">or</div>
-            <div class="govuk-radios__item">
-              <input class="govuk-radios__input" id="where-do-you-live-5" name="where-do-you-live" type="radio" value="abroad">
-              <label class="govuk-label govuk-radios__label" for="where-do-you-live-5">
-                I am a British citizen living abroad
+import functools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Marker identifying a layout that loads GOV.UK Frontend from the CDN
+CDN_MARKER = b"cdn.jsdelivr.net"
+
+# How much of the layout to read before falling back to a full scan
+LAYOUT_HEAD_SIZE = 8192
+
+# Directory holding the sample page templates, next to this script
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Matches {key} placeholders in the page templates
+PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+def render(template, **context):
+    """Fill {key} placeholders in a template in one pass, leaving unknown keys alone"""
+    return PLACEHOLDER_RE.sub(lambda m: context.get(m.group(1), m.group(0)), template)
+
+# Answers for the question page, in order; None marks the "or" divider
+RADIOS = [
+    ("england", "England"),
+    ("scotland", "Scotland"),
+    ("wales", "Wales"),
+    ("northern-ireland", "Northern Ireland"),
+    None,
+    ("abroad", "I am a British citizen living abroad"),
+]
+
+RADIO_ITEM = """            <div class="govuk-radios__item">
+              <input class="govuk-radios__input" id="{id}" name="where-do-you-live" type="radio" value="{value}">
+              <label class="govuk-label govuk-radios__label" for="{id}">
+                {label}
               </label>
-            </div>
-          </div>
-        </fieldset>
-      </div>
-
-      <button class="govuk-button" data-module="govuk-button">
-        Continue
-      </button>
-    </form>
-  </div>
-</div>
-"""
-    
-    with open(os.path.join(site_dir, "question-page.md"), 'w') as f:
-        f.write(content)
-    print("Created question-page.md")
-
-def create_components_page(site_dir):
-    """Create a sample components page"""
-    content = """---
-layout: govuk-default
-title: Component examples
-show_back_link: true
-show_phase_banner: true
-phase: beta
----
-
-<div class="govuk-grid-row">
-  <div class="govuk-grid-column-full">
-    <h1 class="govuk-heading-xl">GOV.UK Frontend Components</h1>
-    
-    <p class="govuk-body-l">This page demonstrates various GOV.UK Frontend components.</p>
-  </div>
-</div>
-
-<div class="govuk-grid-row">
-  <div class="govuk-grid-column-two-thirds">
-    <h2 class="govuk-heading-l">Typography</h2>
-    
-    <h1 class="govuk-heading-xl">govuk-heading-xl</h1>
-    <h2 class="govuk-heading-l">govuk-heading-l</h2>
-    <h3 class="govuk-heading-m">govuk-heading-m</h3>
-    <h4 class="govuk-heading-s">govuk-heading-s</h4>
-    
-    <p class="govuk-body-l">govuk-body-l</p>
-    <p class="govuk-body">govuk-body</p>
-    <p class="govuk-body-s">govuk-body-s</p>
-    
-    <h2 class="govuk-heading-l">Buttons</h2>
-    
-    <button class="govuk-button" data-module="govuk-button">
-      Default button
-    </button>
-    
-    <button class="govuk-button govuk-button--secondary" data-module="govuk-button">
-      Secondary button
-    </button>
-    
-    <button class="govuk-button govuk-button--warning" data-module="govuk-button">
-      Warning button
-    </button>
-    
-    <button class="govuk-button" disabled="disabled" aria-disabled="true" data-module="govuk-button">
-      Disabled button
-    </button>
-    
-    <h2 class="govuk-heading-l">Text input</h2>
-    
-    <div class="govuk-form-group">
-      <label class="govuk-label" for="input-example">
-        National Insurance number
-      </label>
-      <div id="input-example-hint" class="govuk-hint">
-        It's on your National Insurance card, benefit letter, payslip or P60. For example, 'QQ 12 34 56 C'.
-      </div>
-      <input class="govuk-input" id="input-example" name="test-name" type="text" aria-describedby="input-example-hint">
-    </div>
-    
-    <h2 class="govuk-heading-l">Error messages</h2>
-    
-    <div class="govuk-form-group govuk-form-group--error">
-      <label class="govuk-label" for="file-upload-1">
-        Upload a file
-      </label>
-      <div id="file-upload-1-hint" class="govuk-hint">
-        The file must be a PDF
-      </div>
-      <span id="file-upload-1-error" class="govuk-error-message">
-        <span class="govuk-visually-hidden">Error:</span> The file must be a PDF
-      </span>
-      <input class="govuk-file-upload govuk-file-upload--error" id="file-upload-1" name="file-upload-1" type="file" aria-describedby="file-upload-1-hint file-upload-1-error">
-    </div>
-    
-    <h2 class="govuk-heading-l">Warning text</h2>
-    
-    <div class="govuk-warning-text">
-      <span class="govuk-warning-text__icon" aria-hidden="true">!</span>
-      <strong class="govuk-warning-text__text">
-        <span class="govuk-warning-text__assistive">Warning</span>
-        You can be fined up to £5,000 if you don't register.
-      </strong>
-    </div>
-    
-    <h2 class="govuk-heading-l">Summary list</h2>
-    
-    <dl class="govuk-summary-list">
-      <div class="govuk-summary-list__row">
-        <dt class="govuk-summary-list__key">
-          Name
-        </dt>
-        <dd class="govuk-summary-list__value">
-          Sarah Philips
-        </dd>
-        <dd class="govuk-summary-list__actions">
-          <a class="govuk-link" href="#">
-            Change<span class="govuk-visually-hidden"> name</span>
-          </a>
-        </dd>
-      </div>
-      <div class="govuk-summary-list__row">
-        <dt class="govuk-summary-list__key">
-          Date of birth
-        </dt>
-        <dd class="govuk-summary-list__value">
-          5 January 1978
-        </dd>
-        <dd class="govuk-summary-list__actions">
-          <a class="govuk-link" href="#">
-            Change<span class="govuk-visually-hidden"> date of birth</span>
-          </a>
-        </dd>
-      </div>
-      <div class="govuk-summary-list__row">
-        <dt class="govuk-summary-list__key">
-          Address
-        </dt>
-        <dd class="govuk-summary-list__value">
-          72 Guild Street<br>London<br>SE23 6FH
-        </dd>
-        <dd class="govuk-summary-list__actions">
-          <a class="govuk-link" href="#">
-            Change<span class="govuk-visually-hidden"> address</span>
-          </a>
-        </dd>
-      </div>
-      <div class="govuk-summary-list__row">
-        <dt class="govuk-summary-list__key">
-          Contact details
-        </dt>
-        <dd class="govuk-summary-list__value">
-          <p class="govuk-body">07700 900457</p>
-          <p class="govuk-body">sarah.phillips@example.com</p>
-        </dd>
-        <dd class="govuk-summary-list__actions">
-          <a class="govuk-link" href="#">
-            Change<span class="govuk-visually-hidden"> contact details</span>
-          </a>
-        </dd>
-      </div>
-    </dl>
-    
-    <h2 class="govuk-heading-l">Notification banner</h2>
-    
-    <div class="govuk-notification-banner" role="region" aria-labelledby="govuk-notification-banner-title" data-module="govuk-notification-banner">
-      <div class="govuk-notification-banner__header">
-        <h2 class="govuk-notification-banner__title" id="govuk-notification-banner-title">
-          Important
-        </h2>
-      </div>
-      <div class="govuk-notification-banner__content">
-        <p class="govuk-notification-banner__heading">
-          You have 7 days left to send your application.
-          <a class="govuk-notification-banner__link" href="#">View application</a>.
-        </p>
-      </div>
-    </div>
-    
-    <div class="govuk-notification-banner govuk-notification-banner--success" role="alert" aria-labelledby="govuk-notification-banner-title" data-module="govuk-notification-banner">
-      <div class="govuk-notification-banner__header">
-        <h2 class="govuk-notification-banner__title" id="govuk-notification-banner-title">
-          Success
-        </h2>
-      </div>
-      <div class="govuk-notification-banner__content">
-        <h3 class="govuk-notification-banner__heading">
-          Application complete
-        </h3>
-        <p class="govuk-body">
-          Your reference number is <br><strong>HDJ2123F</strong>
-        </p>
-      </div>
-    </div>
-  </div>
-</div>
-"""
-    
-    with open(os.path.join(site_dir, "components.md"), 'w') as f:
-        f.write(content)
-    print("Created components.md")
+            </div>"""
+
+RADIO_DIVIDER = """            <div class="govuk-radios__divider">or</div>"""
+
+def build_radios(radios):
+    """Render the radio items, numbering the ids the way GOV.UK Frontend does"""
+    html = []
+    count = 0
+    for radio in radios:
+        if radio is None:
+            html.append(RADIO_DIVIDER)
+            continue
+        count += 1
+        value, label = radio
+        item_id = "where-do-you-live" if count == 1 else f"where-do-you-live-{count}"
+        html.append(RADIO_ITEM.format(id=item_id, value=value, label=label))
+    return "\n".join(html)
+
+# Build the radio markup once at import rather than repeating it in the page
+RADIO_HTML = build_radios(RADIOS)
+
+# Sample pages to create, each rendered from the template of the same name
+PAGES = ["start-page.md", "question-page.md", "components.md"]
+
+@functools.lru_cache(maxsize=None)
+def load_template(name):
+    """Read a page template from the templates directory, at most once"""
+    with open(os.path.join(TEMPLATES_DIR, name), 'r', encoding='utf-8') as f:
+        return f.read()
+
+@functools.lru_cache(maxsize=None)
+def page_blob(name):
+    """Return a page's rendered UTF-8 content, building it on first use only"""
+    return render(load_template(name), radios=RADIO_HTML).encode('utf-8')
+
+def page_unchanged(path, data):
+    """Check whether a page file already holds exactly the given bytes"""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+def write_pages(site_dir, pages):
+    """Write (file name, bytes) pairs into the site concurrently"""
+    site_dir = Path(site_dir)
+    
+    def write_page(page):
+        name, data = page
+        path = site_dir / name
+        # Leave identical pages untouched so their mtimes don't trigger a Jekyll rebuild
+        if page_unchanged(path, data):
+            return name, False
+        # Write straight to the file descriptor, skipping the text and buffer layers.
+        # O_BINARY stops Windows translating '\n' to '\r\n', which would make every page look changed
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            # Slice a memoryview so a short write doesn't copy the remaining bytes
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        return name, True
+    
+    # Each page is written to its own file, so the writes can run side by side
+    with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+        for name, written in executor.map(write_page, pages):
+            if written:
+                print(f"Created {name}")
+            else:
+                print(f"Unchanged {name}")
 
 def detect_asset_mode(site_dir):
     """Detect whether the site is using CDN or self-hosted assets"""
-    layout_path = os.path.join(site_dir, "_layouts", "govuk-default.html")
-    if not os.path.exists(layout_path):
+    layout_path = Path(site_dir, "_layouts", "govuk-default.html")
+    if not layout_path.exists():
         print("Warning: Could not detect asset mode. Layout file not found.")
         return "unknown"
     
-    with open(layout_path, 'r') as f:
-        content = f.read()
-    
-    if "cdn.jsdelivr.net" in content:
+    # Normalise the path so equivalent spellings of a site share a cache entry
+    return detect_layout_asset_mode(os.path.abspath(layout_path))
+
+@functools.lru_cache(maxsize=None)
+def detect_layout_asset_mode(layout_path):
+    """Detect the asset mode from a layout file, reading it at most once"""
+    with open(layout_path, 'rb') as f:
+        # The CDN links sit in the <head>, so a single bounded read usually settles it
+        head = f.read(LAYOUT_HEAD_SIZE)
+        if CDN_MARKER in head:
+            return "CDN"
+        if len(head) < LAYOUT_HEAD_SIZE:
+            return "self-hosted"
+        # Otherwise search the mapped file directly rather than decoding it into a string
+        import mmap
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            found = mm.find(CDN_MARKER) != -1
+    
+    if found:
         return "CDN"
     else:
         return "self-hosted"
 
 def main():
-    parser = argparse.ArgumentParser(description="Generate sample pages for GOV.UK Frontend Jekyll site")
-    parser.add_argument("site_dir", nargs="?", default="test_jekyll_site", help="Directory of the Jekyll site")
-    
-    args = parser.parse_args()
-    
-    if not os.path.isdir(args.site_dir):
-        print(f"Error: Directory '{args.site_dir}' does not exist.")
+    # A single optional positional argument doesn't need argparse
+    args = sys.argv[1:]
+    if "-h" in args or "--help" in args:
+        print(__doc__.strip())
+        return
+    if len(args) > 1:
+        print(f"Error: Unexpected arguments: {' '.join(args[1:])}")
+        sys.exit(2)
+    
+    site_arg = args[0] if args else "test_jekyll_site"
+    site_dir = Path(site_arg)
+    
+    if not site_dir.is_dir():
+        print(f"Error: Directory '{site_arg}' does not exist.")
         print("Please run module2_jekyll_structure.py first to create the Jekyll site structure.")
         sys.exit(1)
     
     try:
         # Detect asset mode
-        asset_mode = detect_asset_mode(args.site_dir)
+        asset_mode = detect_asset_mode(site_dir)
         
         # Create sample pages
-        create_start_page(args.site_dir)
-        create_question_page(args.site_dir)
-        create_components_page(args.site_dir)
+        write_pages(site_dir, [(name, page_blob(name)) for name in PAGES])
         
-        print(f"\nSample pages have been created in {args.site_dir}")
-        print(f"Asset mode detected: {asset_mode}")
-        print("To start the Jekyll server, run:")
-        print(f"  cd {args.site_dir}")
-        print(f"  bundle install")
-        print(f"  bundle exec jekyll serve")
-        print("\nYour GOV.UK Frontend Jekyll site is now ready to use!")
+        # Emit the closing instructions with a single write
+        lines = [
+            f"\nSample pages have been created in {site_arg}",
+            f"Asset mode detected: {asset_mode}",
+            "To start the Jekyll server, run:",
+            f"  cd {site_arg}",
+            "  bundle install",
+            "  bundle exec jekyll serve",
+            "\nYour GOV.UK Frontend Jekyll site is now ready to use!",
+        ]
+        sys.stdout.write("\n".join(lines) + "\n")
         
     except Exception as e:
         print(f"Error: {e}")